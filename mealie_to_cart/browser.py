@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import Browser, BrowserContext, sync_playwright
 
 
 @dataclass(frozen=True)
@@ -22,31 +22,94 @@ def browserless_ws_endpoint(*, base_ws_url: str, token: str) -> str:
     - ws://host:port?token=...
     """
     base = base_ws_url.strip()
-    if base.startswith("http://"):
-        base = "ws://" + base.removeprefix("http://")
-    if base.startswith("https://"):
-        base = "wss://" + base.removeprefix("https://")
+    if base.startswith(("http://", "https://")):
+        base = "ws://" + base[7:] if base[4] == ":" else "wss://" + base[8:]
 
-    if "?" in base:
+    q_idx = base.find("?")
+    if q_idx != -1:
         # If caller already provided query params, append.
-        if "token=" in base:
+        if base.find("token=", q_idx) != -1:
             return base
         return base + "&token=" + token
 
     return base + "?token=" + token
 
 
-def smoke_test(*, ws_endpoint: str, out_path: str = "artifacts/smoke.png") -> str:
-    """Connect to Browserless and write a screenshot of a simple page."""
+class PlaywrightPool:
+    """One Playwright driver + CDP browser connection shared across contexts.
+
+    Usage::
+
+        with PlaywrightPool(ws_endpoint) as pool:
+            smoke_test(ws_endpoint=ws_endpoint, context=pool.new_context())
+            open_home_and_screenshot(ws_endpoint=ws_endpoint, context=pool.new_context())
+
+    Connecting over CDP is the expensive part; contexts are cheap, so
+    callers get a fresh context per task and the browser is only closed
+    on pool teardown.
+    """
+
+    def __init__(self, ws_endpoint: str):
+        self.ws_endpoint = ws_endpoint
+        self._pw = None
+        self.browser: Browser | None = None
+
+    def __enter__(self) -> "PlaywrightPool":
+        self._pw = sync_playwright().start()
+        try:
+            self.browser = self._pw.chromium.connect_over_cdp(self.ws_endpoint)
+        except BaseException:
+            # __exit__ won't run when __enter__ fails; stop the driver here.
+            self._pw.stop()
+            self._pw = None
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if self.browser:
+                self.browser.close()
+        finally:
+            if self._pw:
+                self._pw.stop()
+        self._pw = None
+        self.browser = None
+
+    def new_context(self, **kwargs) -> BrowserContext:
+        if self.browser is None:
+            raise RuntimeError("PlaywrightPool is not open")
+        kwargs.setdefault("ignore_https_errors", True)
+        return self.browser.new_context(**kwargs)
+
+
+def smoke_test(
+    *,
+    ws_endpoint: str,
+    out_path: str = "artifacts/smoke.png",
+    context: BrowserContext | None = None,
+) -> str:
+    """Connect to Browserless and write a screenshot of a simple page.
+
+    If *context* is provided (e.g. from a `PlaywrightPool`) it is reused and
+    left open; otherwise a one-off connection is made.
+    """
     out = Path(out_path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    with sync_playwright() as p:
-        browser = p.chromium.connect_over_cdp(ws_endpoint)
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-        page.goto("https://example.com", wait_until="domcontentloaded", timeout=30_000)
-        page.screenshot(path=str(out), full_page=True)
-        browser.close()
+    if context is not None:
+        _screenshot_example(context, out)
+        return str(out)
+
+    with PlaywrightPool(ws_endpoint) as pool:
+        _screenshot_example(pool.new_context(), out)
 
     return str(out)
+
+
+def _screenshot_example(context: BrowserContext, out: Path) -> None:
+    page = context.new_page()
+    try:
+        page.goto("https://example.com", wait_until="domcontentloaded", timeout=30_000)
+        page.screenshot(path=str(out), full_page=True)
+    finally:
+        page.close()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import os
-import json
+import time
 from dataclasses import dataclass
-from urllib.request import Request, urlopen
-from urllib.parse import urlencode
+
+from .http import get_session, json_loads
 
 
 REQUIRED_KEYS = [
@@ -15,6 +15,7 @@ REQUIRED_KEYS = [
     "BROWSERLESS_URL",
     "BROWSERLESS_TOKEN",
 ]
+_REQUIRED_SET = frozenset(REQUIRED_KEYS)
 
 # Infisical connection (read from env vars set in compose)
 INFISICAL_URL = os.environ.get("INFISICAL_URL", "http://192.168.1.220:8089")
@@ -22,6 +23,14 @@ INFISICAL_CLIENT_ID = os.environ.get("INFISICAL_CLIENT_ID", "")
 INFISICAL_CLIENT_SECRET = os.environ.get("INFISICAL_CLIENT_SECRET", "")
 INFISICAL_PROJECT_ID = os.environ.get("INFISICAL_PROJECT_ID", "340a0095-6c0d-4114-b19a-5b2eb4d60d30")
 
+# Process-lifetime caches: config is constant within one CLI invocation.
+_CONFIG_CACHE: dict[str, "Config"] = {}
+_SECRETS_CACHE: dict[str, dict[str, str]] = {}
+# (access_token, monotonic expiry)
+_TOKEN_CACHE: tuple[str, float] | None = None
+# Refresh the token this many seconds before Infisical says it expires.
+_TOKEN_EXPIRY_SLACK_S = 30.0
+
 
 @dataclass(frozen=True)
 class Config:
@@ -35,8 +44,11 @@ class Config:
 
     @staticmethod
     def load_from_infisical(*, env: str = "dev") -> "Config":
-        token = _infisical_login()
-        secrets = _infisical_list_secrets(token, env=env)
+        cached = _CONFIG_CACHE.get(env)
+        if cached is not None:
+            return cached
+
+        secrets = _get_secrets(env)
 
         values: dict[str, str] = {}
         for k in REQUIRED_KEYS:
@@ -47,7 +59,7 @@ class Config:
                 raise RuntimeError(f"Infisical secret {k} is still a placeholder")
             values[k] = val
 
-        return Config(
+        cfg = Config(
             mealie_url=values["MEALIE_URL"].rstrip("/"),
             mealie_api_key=values["MEALIE_API_KEY"],
             walmart_email=values["WALMART_EMAIL"],
@@ -55,34 +67,74 @@ class Config:
             browserless_url=values["BROWSERLESS_URL"].rstrip("/"),
             browserless_token=values["BROWSERLESS_TOKEN"],
         )
+        _CONFIG_CACHE[env] = cfg
+        return cfg
+
+
+def _get_secrets(env: str) -> dict[str, str]:
+    """Fetch (once per process) the parsed secrets for *env*."""
+    secrets = _SECRETS_CACHE.get(env)
+    if secrets is None:
+        secrets = _infisical_list_secrets(_get_token(), env=env)
+        _SECRETS_CACHE[env] = secrets
+    return secrets
+
+
+def _get_token() -> str:
+    """Return a cached access token, logging in again only once it expires."""
+    global _TOKEN_CACHE
+    now = time.monotonic()
+    if _TOKEN_CACHE is not None and now < _TOKEN_CACHE[1]:
+        return _TOKEN_CACHE[0]
+    token, ttl = _infisical_login()
+    _TOKEN_CACHE = (token, now + max(ttl - _TOKEN_EXPIRY_SLACK_S, 0.0))
+    return token
 
 
-def _infisical_login() -> str:
-    """Get an access token via Universal Auth."""
+def _infisical_login() -> tuple[str, float]:
+    """Get an access token via Universal Auth.
+
+    Returns (access_token, ttl_seconds).
+    """
     url = f"{INFISICAL_URL}/api/v1/auth/universal-auth/login"
-    body = json.dumps({
-        "clientId": INFISICAL_CLIENT_ID,
-        "clientSecret": INFISICAL_CLIENT_SECRET,
-    }).encode()
-    req = Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
-    with urlopen(req, timeout=15) as resp:
-        data = json.loads(resp.read())
-    return data["accessToken"]
+    resp = get_session().post(
+        url,
+        json={
+            "clientId": INFISICAL_CLIENT_ID,
+            "clientSecret": INFISICAL_CLIENT_SECRET,
+        },
+        timeout=15,
+    )
+    resp.raise_for_status()
+    data = json_loads(resp.content)
+    return data["accessToken"], float(data.get("expiresIn") or 0)
 
 
 def _infisical_list_secrets(token: str, *, env: str = "dev") -> dict[str, str]:
-    """List all secrets from Infisical for the given environment."""
-    params = urlencode({
+    """List the secrets we need from Infisical for the given environment.
+
+    The endpoint has no server-side key filter, so unrelated project
+    secrets are dropped while parsing.
+    """
+    params = {
         "projectId": INFISICAL_PROJECT_ID,
         "environment": env,
         "secretPath": "/",
-    })
-    url = f"{INFISICAL_URL}/api/v4/secrets?{params}"
-    req = Request(url, headers={"Authorization": f"Bearer {token}"}, method="GET")
-    with urlopen(req, timeout=15) as resp:
-        data = json.loads(resp.read())
+    }
+    url = f"{INFISICAL_URL}/api/v4/secrets"
+    resp = get_session().get(
+        url,
+        params=params,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=15,
+    )
+    resp.raise_for_status()
+    data = json_loads(resp.content)
 
     secrets: dict[str, str] = {}
     for s in data.get("secrets", []):
-        secrets[s["secretKey"]] = s["secretValue"]
+        key = s["secretKey"]
+        if key not in _REQUIRED_SET:
+            continue
+        secrets[key] = s["secretValue"]
     return secrets
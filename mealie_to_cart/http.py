@@ -1,7 +1,30 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Parses a bytes payload; orjson when installed, stdlib json otherwise.
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Shared pooled session so repeated calls to the same host reuse the
+# TCP/TLS connection instead of re-handshaking per request.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def get_session() -> requests.Session:
+    """Return the shared session (e.g. to mount a retry adapter)."""
+    return _session
 
 
 @dataclass(frozen=True)
@@ -12,7 +35,7 @@ class HttpClient:
 
     def get(self, path: str, *, params: dict | None = None) -> requests.Response:
         url = self.base_url.rstrip("/") + "/" + path.lstrip("/")
-        return requests.get(
+        return _session.get(
             url,
             params=params,
             headers={
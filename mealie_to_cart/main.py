@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import queue
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator
 
 from .config import REQUIRED_KEYS, Config
 from .mealie_client import MealieClient
-from .browser import browserless_ws_endpoint, smoke_test
+from .browser import PlaywrightPool, browserless_ws_endpoint, smoke_test
 from .normalize import normalize_line
 from .match import choose_best
+from .models import NormalizedItem, WalmartCandidate
 from .report import ItemReport, build_report
 from .walmart import WalmartConfig, WalmartSession, ensure_logged_in, open_home_and_screenshot, search as walmart_search, add_to_cart, DEFAULT_CDP_URL
 
@@ -70,7 +78,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_sync.add_argument("--list", default="Walmart", help="Mealie list name")
     p_sync.add_argument("--cdp", default=DEFAULT_CDP_URL, help="Kasm browser CDP URL")
     p_sync.add_argument("--env", default="dev")
-    p_sync.add_argument("--delay", type=float, default=3, help="Extra seconds between items (on top of built-in random delays)")
+    p_sync.add_argument("--delay", type=float, default=3, help="Extra seconds between items per search tab (on top of built-in random delays)")
+    p_sync.add_argument("--workers", type=int, default=1, help="Concurrent Walmart search tabs; each adds its own request stream, raising bot-detection risk (cart adds stay serial)")
 
     return p
 
@@ -104,7 +113,8 @@ def main(argv: list[str] | None = None) -> int:
         ws = browserless_ws_endpoint(base_ws_url=cfg.browserless_url, token=cfg.browserless_token)
 
         if args.browserless_cmd == "smoke":
-            out = smoke_test(ws_endpoint=ws, out_path=args.out)
+            with PlaywrightPool(ws) as pool:
+                out = smoke_test(ws_endpoint=ws, out_path=args.out, context=pool.new_context())
             print(f"OK: wrote {out}")
             return 0
 
@@ -113,7 +123,8 @@ def main(argv: list[str] | None = None) -> int:
         ws = browserless_ws_endpoint(base_ws_url=cfg.browserless_url, token=cfg.browserless_token)
 
         if args.walmart_cmd == "home":
-            out = open_home_and_screenshot(ws_endpoint=ws, out_path=args.out)
+            with PlaywrightPool(ws) as pool:
+                out = open_home_and_screenshot(ws_endpoint=ws, out_path=args.out, context=pool.new_context())
             print(f"OK: wrote {out}")
             return 0
 
@@ -160,7 +171,8 @@ def main(argv: list[str] | None = None) -> int:
 
         if args.mealie_cmd == "dump":
             lst = mc.get_shopping_list_by_name(args.list)
-            items = mc.get_list_items(lst.id)
+            # Negative --limit keeps the old slice semantics (drop the last N).
+            items = mc.get_list_items(lst.id, limit=args.limit if args.limit >= 0 else None)
             for it in items[: args.limit]:
                 print(it.display)
             return 0
@@ -171,12 +183,158 @@ def main(argv: list[str] | None = None) -> int:
     raise RuntimeError("unreachable")
 
 
+# Search results keyed by (normalized query, limit). Shopping lists often
+# repeat a query, and each miss costs a full browser round trip. Shared by
+# the search worker threads, hence the lock.
+_SEARCH_CACHE: OrderedDict[tuple[str, int], list[WalmartCandidate]] = OrderedDict()
+_SEARCH_CACHE_MAX = 256
+_search_cache_lock = threading.Lock()
+
+
+def _cached_search(query: str, *, limit: int, session: WalmartSession) -> list[WalmartCandidate]:
+    key = (" ".join(query.lower().split()), limit)
+    with _search_cache_lock:
+        hit = _SEARCH_CACHE.get(key)
+        if hit is not None:
+            _SEARCH_CACHE.move_to_end(key)
+            return list(hit)
+
+    result = walmart_search(query, limit=limit, session=session)
+    if not result:
+        # No cards may just mean a slow render or an overlay: retry next time.
+        return result
+
+    with _search_cache_lock:
+        _SEARCH_CACHE[key] = result
+        if len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX:
+            _SEARCH_CACHE.popitem(last=False)
+    return list(result)
+
+
+@dataclass
+class _SearchOutcome:
+    candidates: list[WalmartCandidate] = field(default_factory=list)
+    # Console lines, printed in item order as outcomes are consumed.
+    log: list[str] = field(default_factory=list)
+    bot_blocked: bool = False
+
+
+def _search_item(normalized: NormalizedItem, ws: WalmartSession, blocked: threading.Event) -> _SearchOutcome:
+    out = _SearchOutcome()
+    try:
+        out.candidates = _cached_search(normalized.query, limit=5, session=ws)
+    except RuntimeError as exc:
+        if "bot block" in str(exc).lower() or "captcha" in str(exc).lower():
+            out.log.append(f"  BOT BLOCK: {exc}")
+            out.log.append("  Aborting remaining searches.")
+            out.bot_blocked = True
+            blocked.set()
+            return out
+        out.log.append(f"  ERROR searching: {exc}")
+    except Exception as exc:
+        out.log.append(f"  ERROR searching: {exc}")
+
+    if not out.candidates and normalized.alt_query:
+        out.log.append(f"  no results, trying alt: {normalized.alt_query}")
+        try:
+            out.candidates = _cached_search(normalized.alt_query, limit=5, session=ws)
+        except Exception as exc:
+            out.log.append(f"  ERROR searching alt: {exc}")
+    return out
+
+
+def _search_all(
+    items: list[NormalizedItem],
+    *,
+    cdp_url: str,
+    workers: int,
+    delay: float,
+) -> Iterator[_SearchOutcome | None]:
+    """Search Walmart for every item using *workers* tabs in the Kasm browser.
+
+    Each worker thread owns its own CDP connection (Playwright's sync API is
+    thread-bound) and pulls items from a shared queue, pacing itself by
+    *delay* between its own searches.
+
+    Outcomes are yielded in item order as soon as each one is ready, so the
+    caller can act on early items while later searches are still running.
+    Once a bot block is hit no new searches start; items never searched
+    yield None.  Close the generator (e.g. with contextlib.closing) to stop
+    the workers when the caller bails out early.
+    """
+    pending: queue.Queue[int] = queue.Queue()
+    for idx in range(len(items)):
+        pending.put(idx)
+    slots: list[Future[_SearchOutcome | None]] = [Future() for _ in items]
+    blocked = threading.Event()
+    n_workers = min(workers, len(items))
+    live = [n_workers]
+    live_lock = threading.Lock()
+
+    def worker() -> None:
+        idx: int | None = None
+        error: BaseException | None = None
+        try:
+            with WalmartSession(cdp_url=cdp_url, new_page=True) as ws:
+                first = True
+                while not blocked.is_set():
+                    try:
+                        idx = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    # Extra pacing between items
+                    if not first and delay > 0:
+                        time.sleep(delay)
+                        if blocked.is_set():
+                            break
+                    first = False
+                    slots[idx].set_result(_search_item(items[idx], ws, blocked))
+                    idx = None
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if idx is not None:
+                pending.put(idx)  # taken but never searched
+            with live_lock:
+                live[0] -= 1
+                last = live[0] == 0
+            # The last worker out settles whatever nobody searched.
+            if last:
+                while True:
+                    try:
+                        idx = pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    if error is not None and not blocked.is_set():
+                        slots[idx].set_exception(error)
+                    else:
+                        slots[idx].set_result(None)
+
+    ex = ThreadPoolExecutor(max_workers=max(1, n_workers))
+    futures = [ex.submit(worker) for _ in range(n_workers)]
+    try:
+        for slot in slots:
+            yield slot.result()
+    finally:
+        # Runs on exhaustion, close() and errors alike: start no new searches,
+        # wait for the ones in flight, and report tabs that died along the way.
+        blocked.set()
+        ex.shutdown(wait=True)
+        for fut in futures:
+            exc = fut.exception()
+            if exc is not None:
+                print(f"  WARNING: search tab failed: {exc}")
+
+
 def _run_sync(args) -> int:
     cfg = Config.load_from_infisical(env=args.env)
     mc = MealieClient(mealie_url=cfg.mealie_url, api_key=cfg.mealie_api_key)
 
     lst = mc.get_shopping_list_by_name(args.list)
-    raw_items = mc.get_list_items(lst.id)
+    raw_items = mc.get_list_items(
+        lst.id, limit=max(args.skip, 0) + args.limit if args.limit > 0 else None
+    )
     if args.skip > 0:
         raw_items = raw_items[args.skip:]
     if args.limit > 0:
@@ -184,23 +342,25 @@ def _run_sync(args) -> int:
 
     print(f"Fetched {len(raw_items)} items from '{args.list}' list.")
 
+    normalized_items = [normalize_line(raw.display) for raw in raw_items]
+    workers = max(1, args.workers)
+    print(f"Searching Walmart with {workers} tab(s)...")
+    searches = _search_all(normalized_items, cdp_url=args.cdp, workers=workers, delay=args.delay)
+
     reports: list[ItemReport] = []
-    bot_blocked = False
 
-    with WalmartSession(cdp_url=args.cdp) as ws:
+    # closing() stops the search tabs if this loop exits early (Ctrl-C, errors).
+    with contextlib.closing(searches) as outcomes, WalmartSession(cdp_url=args.cdp) as ws:
         print("Connected to Kasm browser (persistent session).")
 
-        for idx, raw in enumerate(raw_items):
-            normalized = normalize_line(raw.display)
+        added_any = False
+        for idx, (raw, outcome) in enumerate(zip(raw_items, outcomes)):
+            normalized = normalized_items[idx]
             query = normalized.query
             print(f"\n→ [{idx+1}/{len(raw_items)}] {raw.display}")
             print(f"  query: {query}")
 
-            # Extra pacing between items
-            if idx > 0 and args.delay > 0:
-                time.sleep(args.delay)
-
-            if bot_blocked:
+            if outcome is None:
                 print("  SKIP: bot block active")
                 reports.append(ItemReport(
                     raw=raw.display, query=query, alt_query=normalized.alt_query,
@@ -209,33 +369,18 @@ def _run_sync(args) -> int:
                 ))
                 continue
 
-            try:
-                candidates = walmart_search(query, limit=5, session=ws)
-            except RuntimeError as exc:
-                if "bot block" in str(exc).lower() or "captcha" in str(exc).lower():
-                    print(f"  BOT BLOCK: {exc}")
-                    print("  Aborting remaining searches.")
-                    bot_blocked = True
-                    reports.append(ItemReport(
-                        raw=raw.display, query=query, alt_query=normalized.alt_query,
-                        chosen_title=None, chosen_url=None, chosen_size_oz=None,
-                        chosen_price=None, undersized=False, status="FAILED",
-                    ))
-                    continue
-                print(f"  ERROR searching: {exc}")
-                candidates = []
-            except Exception as exc:
-                print(f"  ERROR searching: {exc}")
-                candidates = []
-
-            if not candidates and normalized.alt_query:
-                print(f"  no results, trying alt: {normalized.alt_query}")
-                try:
-                    candidates = walmart_search(normalized.alt_query, limit=5, session=ws)
-                except Exception as exc:
-                    print(f"  ERROR searching alt: {exc}")
-                    candidates = []
+            for line in outcome.log:
+                print(line)
+
+            if outcome.bot_blocked:
+                reports.append(ItemReport(
+                    raw=raw.display, query=query, alt_query=normalized.alt_query,
+                    chosen_title=None, chosen_url=None, chosen_size_oz=None,
+                    chosen_price=None, undersized=False, status="FAILED",
+                ))
+                continue
 
+            candidates = outcome.candidates
             if not candidates:
                 print("  SKIP: no results")
                 reports.append(ItemReport(
@@ -261,6 +406,10 @@ def _run_sync(args) -> int:
 
             status = "DRY_RUN"
             if not args.dry_run:
+                # Extra pacing between cart actions (kept serial on one tab)
+                if added_any and args.delay > 0:
+                    time.sleep(args.delay)
+                added_any = True
                 try:
                     ok = add_to_cart(c.url, session=ws)
                     status = "ADDED" if ok else "FAILED"
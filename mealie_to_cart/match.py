@@ -2,30 +2,43 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 
 from .models import NormalizedItem, WalmartCandidate
+from .normalize import tokenize
+
+# Unit family -> (ounces per unit, aliases). Counts have no weight equivalent.
+_UNITS: dict[str, tuple[float | None, tuple[str, ...]]] = {
+    "oz": (1.0, ("oz", "fl oz")),
+    "lb": (16.0, ("lb", "lbs")),
+    "g": (1 / 28.3495, ("g", "gram", "grams")),
+    "kg": (35.274, ("kg",)),
+    "ml": (1 / 29.5735, ("ml",)),
+    "l": (33.814, ("l",)),
+    "gal": (128.0, ("gal",)),
+    "ct": (None, ("ct", "count")),
+}
+
+
+def _alias_pattern(aliases: tuple[str, ...]) -> str:
+    # Longest first so "fl oz" wins over "oz"; any spacing between words.
+    ordered = sorted(aliases, key=len, reverse=True)
+    return "|".join(re.escape(a).replace(r"\ ", r"\s*") for a in ordered)
 
+
+# One named group per unit family so the match itself identifies the
+# conversion factor (via ``m.lastgroup``) without a lowercase/strip lookup.
 _SIZE_RE = re.compile(
-    r"(\d+(?:\.\d+)?)\s*(fl\s*oz|oz|lb|lbs|g|gram|grams|kg|ml|l|gal|ct|count)\b",
+    r"(?P<num>\d+(?:\.\d+)?)\s*(?:"
+    + "|".join(f"(?P<{fam}>{_alias_pattern(aliases)})" for fam, (_, aliases) in _UNITS.items())
+    + r")\b",
     re.IGNORECASE,
 )
 
-_TO_OZ: dict[str, float] = {
-    "oz": 1.0,
-    "fl oz": 1.0,
-    "lb": 16.0,
-    "lbs": 16.0,
-    "g": 1 / 28.3495,
-    "gram": 1 / 28.3495,
-    "grams": 1 / 28.3495,
-    "kg": 35.274,
-    "ml": 1 / 29.5735,
-    "l": 33.814,
-    "gal": 128.0,
-}
+_TO_OZ: dict[str, float] = {fam: f for fam, (f, _) in _UNITS.items() if f is not None}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChosenProduct:
     candidate: WalmartCandidate
     score: float
@@ -33,26 +46,42 @@ class ChosenProduct:
     undersized: bool
 
 
+# Size strings ("12 oz") and titles repeat heavily across candidates/queries.
+@lru_cache(maxsize=4096)
 def parse_size(text: str | None) -> float | None:
     if not text:
         return None
     m = _SIZE_RE.search(text)
     if not m:
         return None
-    val = float(m.group(1))
-    unit = m.group(2).lower().strip()
-    factor = _TO_OZ.get(unit)
+    factor = _TO_OZ.get(m.lastgroup)
     if factor is None:
         return None
-    return round(val * factor, 4)
+    return float(m.group("num")) * factor
 
 
 def score_relevance(query: str, title: str) -> float:
-    q_tokens = set(re.findall(r"\w+", query.lower()))
-    t_tokens = set(re.findall(r"\w+", title.lower()))
-    if not q_tokens:
+    q_tokens = tokenize(query)
+    return _score(q_tokens, len(q_tokens), title)
+
+
+def _score(q_tokens: frozenset[str], q_len: int, title: str) -> float:
+    """Relevance of *title* against pre-tokenized query tokens.
+
+    Counts the overlap by probing the larger set with the smaller one
+    rather than materializing the intersection.
+    """
+    if not q_len:
+        return 0.0
+    # A query token can only match a title token if it occurs in the title
+    # text, so skip tokenizing titles with no overlap at all.
+    title_low = title.lower()
+    if not any(q in title_low for q in q_tokens):
         return 0.0
-    return len(q_tokens & t_tokens) / len(q_tokens)
+    t_tokens = tokenize(title_low)
+    small, big = (t_tokens, q_tokens) if len(t_tokens) < q_len else (q_tokens, t_tokens)
+    hits = sum(1 for t in small if t in big)
+    return hits / q_len
 
 
 def choose_best(
@@ -66,25 +95,44 @@ def choose_best(
     if requested_oz is None and item.grams is not None:
         requested_oz = item.grams / 28.3495
 
-    scored: list[tuple[WalmartCandidate, float, float | None]] = []
+    # normalize_line precomputes the query tokens; items built by hand may not.
+    q_tokens = item.query_tokens or tokenize(item.query)
+    q_len = len(q_tokens)
+
+    if requested_oz is not None and requested_oz <= 0:
+        requested_oz = None
+
+    # Single pass tracking the best candidate per bucket. Strict comparisons
+    # keep the earliest candidate on ties (Walmart's own ranking).
+    #   bigger:    smallest size >= requested, then most relevant
+    #   undersized: most relevant, then largest size
+    #   best_any:  most relevant (used when no size applies)
+    bigger: tuple[WalmartCandidate, float, float] | None = None
+    undersized: tuple[WalmartCandidate, float, float] | None = None
+    best_any: tuple[WalmartCandidate, float, float | None] | None = None
     for c in candidates:
-        rel = score_relevance(item.query, c.title)
-        sz = parse_size(c.size_text) or parse_size(c.title)
-        scored.append((c, rel, sz))
-
-    if requested_oz is not None and requested_oz > 0:
-        bigger = [(c, r, s) for c, r, s in scored if s is not None and s >= requested_oz]
-        if bigger:
-            bigger.sort(key=lambda x: (x[2], -x[1]))
-            c, r, s = bigger[0]
-            return ChosenProduct(candidate=c, score=r, size_oz=s, undersized=False)
-
-        with_size = [(c, r, s) for c, r, s in scored if s is not None]
-        if with_size:
-            with_size.sort(key=lambda x: (-x[1], -(x[2] or 0)))
-            c, r, s = with_size[0]
-            return ChosenProduct(candidate=c, score=r, size_oz=s, undersized=True)
-
-    scored.sort(key=lambda x: -x[1])
-    c, r, s = scored[0]
+        rel = _score(q_tokens, q_len, c.title)
+        sz = parse_size(c.size_text)
+        if sz is None:
+            sz = parse_size(c.title)
+
+        if best_any is None or rel > best_any[1]:
+            best_any = (c, rel, sz)
+        if requested_oz is None or sz is None:
+            continue
+        if sz >= requested_oz:
+            if bigger is None or (sz, -rel) < (bigger[2], -bigger[1]):
+                bigger = (c, rel, sz)
+        elif bigger is None:
+            if undersized is None or (rel, sz) > (undersized[1], undersized[2]):
+                undersized = (c, rel, sz)
+
+    if bigger is not None:
+        c, r, s = bigger
+        return ChosenProduct(candidate=c, score=r, size_oz=s, undersized=False)
+    if undersized is not None:
+        c, r, s = undersized
+        return ChosenProduct(candidate=c, score=r, size_oz=s, undersized=True)
+
+    c, r, s = best_any
     return ChosenProduct(candidate=c, score=r, size_oz=s, undersized=False)
@@ -1,18 +1,53 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
-from .http import HttpClient
+from .http import HttpClient, json_loads
 
 
-@dataclass(frozen=True)
+# Mealie nightly uses /api/households/...; older versions used /api/groups/...
+_API_PREFIXES = ("/api/households/shopping", "/api/groups/shopping")
+
+# Row keys that may hold an item's display text, in order of preference.
+_DISPLAY_KEYS = ("display", "text", "originalText", "food", "label")
+
+# Discovered prefix per Mealie URL, persisted so cold starts skip the probe.
+# Lives in data/ next to the Walmart storage state: that is the directory
+# the compose setup keeps across `docker compose run --rm` containers.
+_PREFIX_CACHE_PATH = Path("data/mealie_api_prefix.json")
+
+
+def _read_prefix_cache() -> dict[str, str]:
+    try:
+        data = json.loads(_PREFIX_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_prefix_cache(mealie_url: str, prefix: str) -> None:
+    # Best-effort: a read-only home dir must not break a sync.
+    data = _read_prefix_cache()
+    if data.get(mealie_url) == prefix:
+        return
+    data[mealie_url] = prefix
+    try:
+        _PREFIX_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _PREFIX_CACHE_PATH.write_text(json.dumps(data, indent=2))
+    except OSError:
+        pass
+
+
+@dataclass(frozen=True, slots=True)
 class ShoppingList:
     id: str
     name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MealieListItem:
     id: str
     note: str | None
@@ -24,19 +59,26 @@ class MealieListItem:
 class MealieClient:
     def __init__(self, *, mealie_url: str, api_key: str):
         self.http = HttpClient(base_url=mealie_url, token=api_key)
+        self._mealie_url = mealie_url.rstrip("/")
+        cached = _read_prefix_cache().get(self._mealie_url)
+        self._api_prefix: str | None = cached if cached in _API_PREFIXES else None
 
     def get_shopping_list_by_name(self, name: str) -> ShoppingList:
-        lists = self.list_shopping_lists()
-        for lst in lists:
-            if lst.name.strip().lower() == name.strip().lower():
+        target = name.strip().lower()
+        for lst in self.list_shopping_lists():
+            if lst.name.strip().lower() == target:
                 return lst
         raise RuntimeError(f"Shopping list not found: {name}")
 
     def list_shopping_lists(self) -> list[ShoppingList]:
-        # Mealie nightly uses /api/households/...; older versions used /api/groups/...
-        for prefix in ("/api/households/shopping/lists", "/api/groups/shopping/lists"):
+        # Try the cached prefix first; only probe the others if it fails.
+        prefixes = list(_API_PREFIXES)
+        if self._api_prefix is not None:
+            prefixes.remove(self._api_prefix)
+            prefixes.insert(0, self._api_prefix)
+        for prefix in prefixes:
             try:
-                data = self._get_json(prefix, params={"perPage": -1})
+                data = self._get_json(f"{prefix}/lists", params={"perPage": -1})
                 items = data.get("items") or data.get("data") or data
                 out: list[ShoppingList] = []
                 for row in items:
@@ -45,30 +87,35 @@ class MealieClient:
                     if _id and nm:
                         out.append(ShoppingList(id=str(_id), name=str(nm)))
                 if out:
-                    self._api_prefix = prefix.rsplit("/lists", 1)[0]
+                    self._api_prefix = prefix
+                    _write_prefix_cache(self._mealie_url, prefix)
                     return out
             except RuntimeError:
                 continue
         raise RuntimeError("No shopping lists returned (tried both /households/ and /groups/ endpoints)")
 
-    def get_list_items(self, list_id: str) -> list[MealieListItem]:
-        prefix = getattr(self, "_api_prefix", "/api/households/shopping")
+    def get_list_items(self, list_id: str, *, limit: int | None = None) -> list[MealieListItem]:
+        """Return the list's items, stopping after *limit* usable rows if given."""
+        if limit is not None and limit <= 0:
+            return []
+        prefix = self._api_prefix or _API_PREFIXES[0]
         data = self._get_json(f"{prefix}/items", params={"perPage": -1, "shoppingListId": list_id})
         items = data.get("items") or data.get("data") or data
         out: list[MealieListItem] = []
+        # The display field depends on the Mealie version, not the row: find it
+        # on the first row that has one, then read it directly.
+        display_key: str | None = None
         for row in items:
             _id = row.get("id") or row.get("uuid")
             note = row.get("note")
-            # display text can vary; try multiple candidates
-            display = (
-                row.get("display")
-                or row.get("text")
-                or row.get("originalText")
-                or row.get("food")
-                or row.get("label")
-                or ""
-            )
-            qty = row.get("quantity")
+            display = row.get(display_key) if display_key else None
+            if not display:
+                display_key = next((k for k in _DISPLAY_KEYS if row.get(k)), None)
+                display = row.get(display_key) if display_key else ""
+            try:
+                qty = float(row.get("quantity"))
+            except (TypeError, ValueError):
+                qty = None
             unit = row.get("unit")
             if _id and display:
                 out.append(
@@ -76,10 +123,12 @@ class MealieClient:
                         id=str(_id),
                         note=str(note) if note is not None else None,
                         display=str(display),
-                        quantity=float(qty) if isinstance(qty, (int, float)) else None,
+                        quantity=qty,
                         unit=str(unit) if unit is not None else None,
                     )
                 )
+                if limit is not None and len(out) >= limit:
+                    break
         return out
 
     def _get_json(self, path: str, *, params: dict[str, Any] | None = None) -> dict[str, Any]:
@@ -87,6 +136,6 @@ class MealieClient:
         if resp.status_code >= 400:
             raise RuntimeError(f"Mealie API error {resp.status_code} for {path}: {resp.text[:500]}")
         try:
-            return resp.json()
+            return json_loads(resp.content)
         except Exception as e:
             raise RuntimeError(f"Failed to decode JSON from Mealie for {path}: {e}")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NormalizedItem:
     raw: str
 
@@ -21,8 +21,11 @@ class NormalizedItem:
     grams: float | None = None
     ounces: float | None = None
 
+    # Lowercased word tokens of `query`, precomputed for relevance scoring.
+    query_tokens: frozenset[str] = field(default=frozenset(), repr=False)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class WalmartCandidate:
     """A single product result from a Walmart search."""
 
@@ -1,77 +1,118 @@
 from __future__ import annotations
 
 import re
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 
 from .models import NormalizedItem
 
 
-_FRACTION_RE = re.compile(r"^(?:(\d+)\s+)?(\d+)\/(\d+)$")
-
-
-def parse_quantity_token(tok: str) -> float | None:
-    """Parse tokens like '1', '1/2', '2 1/2' (the mixed form handled by caller)."""
-    tok = tok.strip()
-    if not tok:
-        return None
-
-    # simple int/float
-    try:
-        return float(tok)
-    except ValueError:
-        pass
-
-    m = _FRACTION_RE.match(tok)
-    if m:
-        whole, num, den = m.groups()
-        val = (int(num) / int(den))
-        if whole:
-            val += int(whole)
-        return float(val)
-
-    # unicode halves/quarters (minimal set)
-    unicode_map = {
-        "½": 0.5,
-        "¼": 0.25,
-        "¾": 0.75,
-        "⅓": 1 / 3,
-        "⅔": 2 / 3,
-    }
-    if tok in unicode_map:
-        return float(unicode_map[tok])
-
-    return None
-
-
-def _split_or(raw: str) -> tuple[str, str | None]:
-    # Split on the first standalone ' or ' (case-insensitive)
-    parts = re.split(r"\s+or\s+", raw, maxsplit=1, flags=re.IGNORECASE)
-    if len(parts) == 2:
-        return parts[0].strip(), parts[1].strip()
-    return raw.strip(), None
+# Unicode halves/quarters/thirds (minimal set), rewritten to ASCII once per
+# line so the quantity regexes only ever see digits and slashes.  The leading
+# space keeps "1½" apart as "1 1/2".
+_FRAC_TRANSLATE = str.maketrans({
+    "½": " 1/2",
+    "¼": " 1/4",
+    "¾": " 3/4",
+    "⅓": " 1/3",
+    "⅔": " 2/3",
+})
+
+_WORD_RE = re.compile(r"\w+")
+
+# Compiled once at import; every ingredient line runs through these.
+# Parentheticals and the ' or ' split point, found in a single scan.
+_LINE_RE = re.compile(r"\((?P<paren>[^)]*)\)|\s+or\s+", re.IGNORECASE)
+_RE_PARENS = re.compile(r"\([^)]*\)")
+_RE_ORPHAN_PARENS = re.compile(r"[()]")
+_RE_GRAMS = re.compile(r"(\d+(?:\.\d+)?)\s*(g|gram|grams)\b")
+
+_UNIT_WORDS = r"(cups?|teaspoons?|tablespoons?|tbsp|tsp|oz|ounces?|lbs?|pounds?|grams?|g|kg|ml|l|liters?)"
+
+# Independent "fluff" removals, applied in one scan. Each alternative is
+# deleted wherever it matches; NOT is deliberately case-sensitive.
+_CLEAN_RE = re.compile(
+    r"(?P<star>[*…]+$)"  # trailing asterisks, ellipsis
+    r"|(?P<filler>^(?:totally optional[:\s]*|optional[:\s]*|about\s+))"  # leading filler
+    r"|(?P<notblk>(?-i:\bNOT\b)[^,;)]*)"  # "NOT ..." advice
+    r"|(?P<plusmore>,\s*plus\s+more\b.*$)"  # ", plus more to swirl on top"
+    r"|(?P<about>\s+about\s+.*$)"  # trailing "about N ..." fragments
+    r"|(?P<choice>\s+of\s+choice\b)"  # "of choice" — just search the ingredient
+    r"|(?P<mixin>\bmix-?ins?\s+like\s+)"  # "mix-ins like" and similar
+    r"|(?P<prep>\b(?:mashed|ripe|melted|chopped|diced|minced|sliced|crushed|fresh|dried)\s+)",  # prep words
+    re.IGNORECASE,
+)
+
+_RE_QTY_UNIT = re.compile(r"^[\d/]+\s*" + _UNIT_WORDS + r"\s+", re.IGNORECASE)
+_RE_LEADING_UNIT = re.compile(r"^" + _UNIT_WORDS + r"\s+", re.IGNORECASE)
+_RE_WS = re.compile(r"\s{2,}")
+
+# Anything _clean_query could act on; a superset of the passes above, so a
+# query with no match here is already clean.
+_NEEDS_CLEAN_RE = re.compile(
+    r"[()*…]"  # parentheticals, trailing asterisks/ellipsis
+    r"|^\s*[\d/:,;.]|[:,;.]\s*$"  # leading quantity, stray punctuation at the ends
+    r"|^\s*" + _UNIT_WORDS + r"\s"  # leading unit word
+    r"|\s{2,}"
+    r"|^\s*(?:totally\s+)?optional"  # leading filler, even glued to the next word
+    r"|\b(?:optional|about|not|plus|choice|mix-?ins?"
+    r"|mashed|ripe|melted|chopped|diced|minced|sliced|crushed|fresh|dried)\b",
+    re.IGNORECASE,
+)
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """Lowercased word tokens used for relevance scoring."""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+def _scan_line(raw: str) -> tuple[str, str | None, float | None]:
+    """Split *raw* on its first standalone ' or ' and drop parentheticals.
+
+    One scan finds both the balanced parentheticals and the split point, so
+    an ' or ' inside parentheses does not split the line.  Grams come from
+    the first parenthetical, e.g. (75 grams) (168 g).
+
+    Returns (left, right, grams); right is None when there is no ' or '.
+    """
+    grams: float | None = None
+    seen_paren = False
+    left: str | None = None
+    pieces: list[str] = []
+    pos = 0
+    for m in _LINE_RE.finditer(raw):
+        if m["paren"] is None:
+            if left is not None:
+                continue  # only the first ' or ' splits
+            pieces.append(raw[pos:m.start()])
+            left = "".join(pieces)
+            pieces = []
+        else:
+            pieces.append(raw[pos:m.start()])
+            if not seen_paren:
+                seen_paren = True
+                g = _RE_GRAMS.search(m["paren"].lower())
+                if g:
+                    grams = float(g.group(1))
+        pos = m.end()
+    pieces.append(raw[pos:])
+    tail = "".join(pieces)
+
+    if left is None:
+        return tail.strip(), None, grams
+    return left.strip(), tail.strip(), grams
 
 
 def _strip_parentheticals(s: str) -> str:
     # Remove balanced parentheticals
-    s = re.sub(r"\([^)]*\)", "", s).strip()
+    s = _RE_PARENS.sub("", s).strip()
     # Clean up orphaned open/close parens that remain
-    s = re.sub(r"[()]", "", s).strip()
+    s = _RE_ORPHAN_PARENS.sub("", s).strip()
     return s
 
 
-def _extract_parenthetical_grams(raw: str) -> float | None:
-    # examples: (75 grams) (168 g)
-    m = re.search(r"\(([^)]*?)\)", raw)
-    if not m:
-        return None
-    txt = m.group(1).lower()
-    m2 = re.search(r"(\d+(?:\.\d+)?)\s*(g|gram|grams)\b", txt)
-    if not m2:
-        return None
-    return float(m2.group(1))
-
-
-_UNIT_ALIASES: dict[str, str] = {
+_UNIT_ALIASES: dict[str, str] = {sys.intern(k): sys.intern(v) for k, v in {
     "cups": "cup",
     "cup": "cup",
     "tbsp": "tbsp",
@@ -96,52 +137,47 @@ _UNIT_ALIASES: dict[str, str] = {
     "l": "l",
     "liter": "l",
     "liters": "l",
-}
+}.items()}
+
+# Leading "qty unit" / "whole qty unit" where qty is a fraction or decimal,
+# e.g. "2 1/2 cups", "0.5 l".  Unicode fractions are already ASCII here.
+_LEADING_QTY_RE = re.compile(
+    r"""
+    ^\s*
+    (?:(?P<whole>\d+)\s+)?                   # optional whole part of "2 1/2"
+    (?:
+        (?P<num>\d+)\s*/\s*(?P<den>\d+)     # fraction
+      | (?P<dec>\d+(?:\.\d+)?|\.\d+)        # integer or decimal
+    )
+    \s+(?P<unit>[A-Za-z]+)\b
+    """,
+    re.VERBOSE,
+)
+
+
+def _unit_alias(tok: str) -> str | None:
+    # Mealie text is mostly lowercase already: try as-is before lowering.
+    return _UNIT_ALIASES.get(tok) or _UNIT_ALIASES.get(tok.lower())
 
 
 def _clean_query(q: str) -> str:
     """Strip noise from a query string to produce a clean Walmart search term."""
+    if not _NEEDS_CLEAN_RE.search(q):
+        return _cap_words(q.strip())
     # Strip parentheticals that may have survived
     q = _strip_parentheticals(q)
-    # Remove trailing asterisks, ellipsis, and similar
-    q = re.sub(r"[*…]+$", "", q).strip()
-    # Remove leading filler phrases
-    q = re.sub(
-        r"^(totally optional[:\s]*|optional[:\s]*|about\s+)",
-        "",
-        q,
-        flags=re.IGNORECASE,
-    ).strip()
-    # Remove "NOT ..." parenthetical advice
-    q = re.sub(r"\bNOT\b[^,;)]*", "", q).strip()
-    # Remove trailing filler like ", plus more to swirl on top"
-    q = re.sub(r",\s*plus\s+more\b.*$", "", q, flags=re.IGNORECASE).strip()
-    # Remove trailing "about N ..." fragments
-    q = re.sub(r"\s+about\s+.*$", "", q, flags=re.IGNORECASE).strip()
-    # Remove "of choice" — just search the ingredient
-    q = re.sub(r"\s+of\s+choice\b", "", q, flags=re.IGNORECASE).strip()
-    # Remove "mix-ins like" and similar fluff
-    q = re.sub(r"\bmix-?ins?\s+like\s+", "", q, flags=re.IGNORECASE).strip()
-    # Remove cooking prep words
-    q = re.sub(r"\b(mashed|ripe|melted|chopped|diced|minced|sliced|crushed|fresh|dried)\s+", "", q, flags=re.IGNORECASE).strip()
-    # Strip leading quantity + unit even if they got through (e.g. "½ cup")
-    q = re.sub(
-        r"^[½¼¾⅓⅔\d/]+\s*(cups?|teaspoons?|tablespoons?|tbsp|tsp|oz|ounces?|lbs?|pounds?|grams?|g|kg|ml|l|liters?)\s+",
-        "",
-        q,
-        flags=re.IGNORECASE,
-    ).strip()
+    # Remove filler phrases, advice, trailing fragments and prep words
+    q = _CLEAN_RE.sub("", q).strip()
+    # Strip leading quantity + unit even if they got through (e.g. "1/2 cup")
+    q = _RE_QTY_UNIT.sub("", q).strip()
     # Strip leading unit words that leaked through (cup/cups/teaspoon/tbsp etc.)
-    q = re.sub(
-        r"^(cups?|teaspoons?|tablespoons?|tbsp|tsp|oz|ounces?|lbs?|pounds?|grams?|g|kg|ml|l|liters?)\s+",
-        "",
-        q,
-        flags=re.IGNORECASE,
-    ).strip()
-    # Remove stray colons, commas at start/end
-    q = q.strip(":,;. ")
-    # Collapse whitespace
-    q = re.sub(r"\s{2,}", " ", q).strip()
+    q = _RE_LEADING_UNIT.sub("", q).strip()
+    # Collapse whitespace; remove stray colons, commas at start/end
+    q = _RE_WS.sub(" ", q).strip(":,;. ")
+    return _cap_words(q)
+
+
+def _cap_words(q: str) -> str:
     # Cap query length — long queries return garbage on Walmart
     words = q.split()
     if len(words) > 5:
@@ -149,21 +185,16 @@ def _clean_query(q: str) -> str:
     return q
 
 
+# Pure in its input and returns a frozen item, so repeated ingredient lines
+# across recipes are served from the cache.
+@lru_cache(maxsize=4096)
 def normalize_line(raw: str) -> NormalizedItem:
-    left, right = _split_or(raw)
-
-    grams = _extract_parenthetical_grams(raw)
-
-    qty, unit = _parse_leading_qty_unit(left)
+    left, right, grams = _scan_line(raw.translate(_FRAC_TRANSLATE))
 
-    query = _strip_parentheticals(left)
-    if qty is not None and unit is not None:
-        # remove the leading qty+unit from query
-        query = re.sub(r"^\s*[^A-Za-z]*", "", query)  # clean leading punctuation
-        query = re.sub(r"^\s*" + re.escape(_leading_text(left)) + r"\s*", "", query, flags=re.IGNORECASE).strip()
+    qty, unit, rest = _split_leading_qty_unit(left)
 
-    query = _clean_query(query)
-    alt_query = _clean_query(_strip_parentheticals(right)) if right else None
+    query = _clean_query(rest)
+    alt_query = _clean_query(right) if right else None
     # Drop alt if it's identical, empty, or just noise after cleaning
     if alt_query and (alt_query.lower() == query.lower() or len(alt_query) < 3):
         alt_query = None
@@ -172,58 +203,39 @@ def normalize_line(raw: str) -> NormalizedItem:
     if grams is not None:
         ounces = grams / 28.349523125
 
+    query = query.strip()
     return NormalizedItem(
         raw=raw,
-        query=query.strip(),
+        query=query,
         alt_query=alt_query.strip() if alt_query else None,
         quantity=qty,
         unit=unit,
         grams=grams,
         ounces=ounces,
+        query_tokens=tokenize(query),
     )
 
 
-def _leading_text(left: str) -> str:
-    # Helper to compute the exact leading substring representing qty+unit for removal.
-    tokens = left.strip().split()
-    if not tokens:
-        return ""
-
-    # mixed number: "2 1/2 cup"
-    if len(tokens) >= 3:
-        q1 = parse_quantity_token(tokens[0])
-        q2 = parse_quantity_token(tokens[1])
-        u = _UNIT_ALIASES.get(tokens[2].lower())
-        if q1 is not None and q2 is not None and u:
-            return " ".join(tokens[:3])
-
-    if len(tokens) >= 2:
-        q = parse_quantity_token(tokens[0])
-        u = _UNIT_ALIASES.get(tokens[1].lower())
-        if q is not None and u:
-            return " ".join(tokens[:2])
-
-    return ""
-
-
-def _parse_leading_qty_unit(left: str) -> tuple[float | None, str | None]:
-    tokens = left.strip().split()
-    if not tokens:
-        return None, None
-
-    # Handle "2 1/2 cup"
-    if len(tokens) >= 3:
-        q1 = parse_quantity_token(tokens[0])
-        q2 = parse_quantity_token(tokens[1])
-        u = _UNIT_ALIASES.get(tokens[2].lower())
-        if q1 is not None and q2 is not None and u:
-            return float(q1 + q2), u
-
-    # Handle "1/3 cup"
-    if len(tokens) >= 2:
-        q = parse_quantity_token(tokens[0])
-        u = _UNIT_ALIASES.get(tokens[1].lower())
-        if q is not None and u:
-            return float(q), u
-
-    return None, None
+def _split_leading_qty_unit(left: str) -> tuple[float | None, str | None, str]:
+    """Split a leading quantity + unit off *left*.
+
+    Returns (qty, unit, rest); when no qty+unit is found, (None, None, left).
+    """
+    m = _LEADING_QTY_RE.match(left)
+    if not m:
+        return None, None, left
+    unit = _unit_alias(m["unit"])
+    if unit is None:
+        return None, None, left
+
+    if m["den"] is not None:
+        den = int(m["den"])
+        if den == 0:
+            return None, None, left
+        qty = int(m["num"]) / den
+    else:
+        qty = float(m["dec"])
+    if m["whole"] is not None:
+        qty += int(m["whole"])
+
+    return qty, unit, left[m.end():].lstrip()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import dataclasses
 import json
-from dataclasses import dataclass, asdict
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .http import orjson  # None without the optional 'fast' extra
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ItemReport:
     raw: str
     query: str
@@ -49,18 +53,33 @@ class RunReport:
     def write_json(self, path: str = "artifacts/run_report.json") -> str:
         out = Path(path)
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(json.dumps(asdict(self), indent=2))
+        if orjson is not None:
+            out.write_bytes(orjson.dumps(
+                self, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS
+            ))
+            return str(out)
+        # Stream to disk; dataclasses are encoded field by field on the fly
+        # rather than deep-copied up front by asdict().
+        with out.open("w") as f:
+            json.dump(self, f, indent=2, default=_encode_dataclass)
         return str(out)
 
 
+def _encode_dataclass(o):
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return {f.name: getattr(o, f.name) for f in dataclasses.fields(o)}
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
 def build_report(items: list[ItemReport], *, dry_run: bool) -> RunReport:
+    counts = Counter(i.status for i in items)
     return RunReport(
         timestamp=datetime.now(timezone.utc).isoformat(),
         total=len(items),
-        added=sum(1 for i in items if i.status == "ADDED"),
-        skipped=sum(1 for i in items if i.status == "SKIPPED_NO_MATCH"),
-        failed=sum(1 for i in items if i.status == "FAILED"),
-        needs_review=sum(1 for i in items if i.status == "NEEDS_REVIEW"),
+        added=counts["ADDED"],
+        skipped=counts["SKIPPED_NO_MATCH"],
+        failed=counts["FAILED"],
+        needs_review=counts["NEEDS_REVIEW"],
         dry_run=dry_run,
         items=items,
     )
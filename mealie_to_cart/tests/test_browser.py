@@ -0,0 +1,23 @@
+import pytest
+
+from mealie_to_cart.browser import browserless_ws_endpoint
+
+
+@pytest.mark.parametrize(
+    "base, expected",
+    [
+        ("http://host:3000", "ws://host:3000?token=T"),
+        ("https://host:3000", "wss://host:3000?token=T"),
+        ("  http://host:3000 ", "ws://host:3000?token=T"),
+        ("ws://host:3000", "ws://host:3000?token=T"),
+        ("wss://host", "wss://host?token=T"),
+        ("http://host?stealth=true", "ws://host?stealth=true&token=T"),
+        ("wss://host?stealth=true&token=X", "wss://host?stealth=true&token=X"),
+        ("ws://host?token=X", "ws://host?token=X"),
+        # A "token=" before the '?' is part of the path, not a query param.
+        ("ws://host/token=X?stealth=true", "ws://host/token=X?stealth=true&token=T"),
+        ("ws://host/token=X", "ws://host/token=X?token=T"),
+    ],
+)
+def test_browserless_ws_endpoint(base, expected):
+    assert browserless_ws_endpoint(base_ws_url=base, token="T") == expected
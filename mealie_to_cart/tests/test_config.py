@@ -0,0 +1,64 @@
+import pytest
+
+from mealie_to_cart import config
+from mealie_to_cart.config import REQUIRED_KEYS, Config
+
+
+class _Infisical:
+    """Stands in for the Infisical login and secrets endpoints."""
+
+    def __init__(self, ttl=600.0):
+        self.ttl = ttl
+        self.logins = 0
+        self.listed: list[tuple[str, str]] = []
+
+    def login(self):
+        self.logins += 1
+        return f"token{self.logins}", self.ttl
+
+    def list_secrets(self, token, *, env="dev"):
+        self.listed.append((token, env))
+        return {k: f"https://{k.lower()}" for k in REQUIRED_KEYS}
+
+
+@pytest.fixture
+def infisical(monkeypatch):
+    fake = _Infisical()
+    now = [1000.0]
+    monkeypatch.setattr(config, "_CONFIG_CACHE", {})
+    monkeypatch.setattr(config, "_SECRETS_CACHE", {})
+    monkeypatch.setattr(config, "_TOKEN_CACHE", None)
+    monkeypatch.setattr(config, "_infisical_login", fake.login)
+    monkeypatch.setattr(config, "_infisical_list_secrets", fake.list_secrets)
+    monkeypatch.setattr(config.time, "monotonic", lambda: now[0])
+    fake.now = now
+    return fake
+
+
+def test_second_load_makes_no_requests(infisical):
+    first = Config.load_from_infisical(env="dev")
+    assert Config.load_from_infisical(env="dev") is first
+    assert infisical.logins == 1
+    assert infisical.listed == [("token1", "dev")]
+
+
+def test_other_env_reuses_the_token(infisical):
+    Config.load_from_infisical(env="dev")
+    Config.load_from_infisical(env="prod")
+    assert infisical.logins == 1
+    assert infisical.listed == [("token1", "dev"), ("token1", "prod")]
+
+
+def test_token_refreshed_shortly_before_expiry(infisical):
+    infisical.ttl = 100.0
+    assert config._get_token() == "token1"
+    infisical.now[0] += 69  # inside expiresIn minus the 30 s slack
+    assert config._get_token() == "token1"
+    infisical.now[0] += 2
+    assert config._get_token() == "token2"
+
+
+def test_short_lived_token_is_never_reused(infisical):
+    infisical.ttl = 10.0  # below the slack: expiry clamps to "now"
+    assert config._get_token() == "token1"
+    assert config._get_token() == "token2"
@@ -0,0 +1,104 @@
+import itertools
+import random
+import time
+
+import pytest
+
+from mealie_to_cart import main
+from mealie_to_cart.models import WalmartCandidate
+from mealie_to_cart.normalize import normalize_line
+
+
+class _FakeSession:
+    def __init__(self, cdp_url, *, new_page=False):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    calls: list[str] = []
+
+    def fake_search(query, *, limit, session):
+        calls.append(query)
+        time.sleep(random.random() * 0.01)
+        if query == "blocked":
+            raise RuntimeError("Bot block detected")
+        if query.startswith("nothing"):
+            return []
+        return [WalmartCandidate(title=query, url=f"https://www.walmart.com/ip/{query}")]
+
+    monkeypatch.setattr(main, "WalmartSession", _FakeSession)
+    monkeypatch.setattr(main, "walmart_search", fake_search)
+    monkeypatch.setattr(main, "_SEARCH_CACHE", main.OrderedDict())
+    return calls
+
+
+def _items(*queries):
+    return [normalize_line(q) for q in queries]
+
+
+def test_search_all_yields_in_item_order(searches):
+    items = _items(*(f"item{i}" for i in range(12)))
+    outcomes = list(main._search_all(items, cdp_url="x", workers=3, delay=0))
+    assert [o.candidates[0].title for o in outcomes] == [it.query for it in items]
+
+
+def test_search_all_skips_items_after_bot_block(searches):
+    items = _items("honey", "blocked", "milk", "eggs")
+    outcomes = list(main._search_all(items, cdp_url="x", workers=1, delay=0))
+    assert outcomes[0].candidates
+    assert outcomes[1].bot_blocked
+    assert outcomes[2:] == [None, None]
+    assert "milk" not in searches
+
+
+def test_search_all_raises_when_every_worker_fails(searches, monkeypatch):
+    class _Unreachable(_FakeSession):
+        def __enter__(self):
+            raise OSError("no CDP endpoint")
+
+    monkeypatch.setattr(main, "WalmartSession", _Unreachable)
+    with pytest.raises(OSError, match="no CDP endpoint"):
+        list(main._search_all(_items("honey", "milk"), cdp_url="x", workers=2, delay=0))
+
+
+def test_repeated_query_served_from_cache(searches):
+    items = _items("honey", "Honey", "milk")
+    outcomes = list(main._search_all(items, cdp_url="x", workers=1, delay=0))
+    assert searches == ["honey", "milk"]
+    assert outcomes[1].candidates == outcomes[0].candidates
+
+
+def test_empty_result_is_not_cached(searches):
+    list(main._search_all(_items("nothing", "nothing"), cdp_url="x", workers=1, delay=0))
+    assert searches == ["nothing", "nothing"]
+
+
+def test_closing_search_all_stops_workers(searches):
+    items = _items(*(f"item{i}" for i in range(30)))
+    outcomes = main._search_all(items, cdp_url="x", workers=1, delay=0)
+    next(outcomes)
+    outcomes.close()
+    assert len(searches) < 5
+
+
+def test_failed_worker_is_reported(searches, monkeypatch, capsys):
+    opened = itertools.count()
+
+    class _FirstFails(_FakeSession):
+        def __enter__(self):
+            if next(opened) == 0:
+                raise OSError("tab crashed")
+            return self
+
+    monkeypatch.setattr(main, "WalmartSession", _FirstFails)
+    items = _items("honey", "milk", "eggs")
+    outcomes = list(main._search_all(items, cdp_url="x", workers=2, delay=0))
+    assert all(o.candidates for o in outcomes)
+    assert "search tab failed: tab crashed" in capsys.readouterr().out
@@ -25,6 +25,15 @@ def test_parse_size_grams():
     assert abs(result - (500 / 28.3495)) < 0.1
 
 
+def test_parse_size_fl_oz():
+    assert abs(parse_size("16 fl oz") - 16.0) < 0.01
+    assert abs(parse_size("16 FL  OZ") - 16.0) < 0.01
+
+
+def test_parse_size_count_has_no_weight():
+    assert parse_size("12 ct") is None
+
+
 def test_parse_size_none():
     assert parse_size(None) is None
     assert parse_size("no size here") is None
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+import requests
+
+from mealie_to_cart import http, mealie_client
+from mealie_to_cart.mealie_client import MealieClient
+
+
+class _Resp:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = payload
+        self.text = payload.decode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class _Session:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return _Resp(self.payload)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(mealie_client, "_PREFIX_CACHE_PATH", tmp_path / "api_prefix.json")
+    session = _Session(
+        b'{"items": [{"id": 1, "display": "honey"}, {"id": 2, "display": "milk"},'
+        b' {"id": 3, "display": "eggs"}]}'
+    )
+    monkeypatch.setattr(http, "_session", session)
+    return MealieClient(mealie_url="http://mealie", api_key="k"), session
+
+
+def test_list_items_limit(client):
+    mc, _ = client
+    assert [it.display for it in mc.get_list_items("l1", limit=2)] == ["honey", "milk"]
+    assert len(mc.get_list_items("l1")) == 3
+
+
+def test_list_items_non_positive_limit_is_empty(client):
+    mc, session = client
+    assert mc.get_list_items("l1", limit=0) == []
+    assert mc.get_list_items("l1", limit=-1) == []
+    assert session.calls == 0
+
+
+_LISTS = b'{"items": [{"id": "l1", "name": "Walmart"}]}'
+
+
+class _Mealie:
+    """Serves shopping lists under *prefix* only; anything else is a 404."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.paths: list[str] = []
+
+    def get(self, url, **kwargs):
+        path = url.removeprefix("http://mealie")
+        self.paths.append(path)
+        if path == f"{self.prefix}/lists":
+            return _Resp(_LISTS)
+        return _Resp(b'{"detail": "Not Found"}', status_code=404)
+
+
+@pytest.fixture
+def prefix_cache(monkeypatch, tmp_path):
+    path = tmp_path / "data" / "mealie_api_prefix.json"
+    monkeypatch.setattr(mealie_client, "_PREFIX_CACHE_PATH", path)
+    return path
+
+
+def _serve(monkeypatch, prefix):
+    server = _Mealie(prefix)
+    monkeypatch.setattr(http, "_session", server)
+    return server
+
+
+def test_discovered_prefix_is_persisted_and_reused(monkeypatch, prefix_cache):
+    server = _serve(monkeypatch, "/api/groups/shopping")
+    MealieClient(mealie_url="http://mealie/", api_key="k").list_shopping_lists()
+    assert server.paths == ["/api/households/shopping/lists", "/api/groups/shopping/lists"]
+    assert json.loads(prefix_cache.read_text()) == {"http://mealie": "/api/groups/shopping"}
+
+    server.paths.clear()
+    MealieClient(mealie_url="http://mealie", api_key="k").list_shopping_lists()
+    assert server.paths == ["/api/groups/shopping/lists"]
+
+
+def test_stale_cached_prefix_falls_back_to_the_other(monkeypatch, prefix_cache):
+    prefix_cache.parent.mkdir()
+    prefix_cache.write_text(json.dumps({"http://mealie": "/api/groups/shopping"}))
+    server = _serve(monkeypatch, "/api/households/shopping")
+
+    lists = MealieClient(mealie_url="http://mealie", api_key="k").list_shopping_lists()
+    assert [lst.name for lst in lists] == ["Walmart"]
+    assert server.paths == ["/api/groups/shopping/lists", "/api/households/shopping/lists"]
+    assert json.loads(prefix_cache.read_text()) == {"http://mealie": "/api/households/shopping"}
+
+
+def test_unreadable_or_foreign_cache_is_ignored(monkeypatch, prefix_cache):
+    prefix_cache.parent.mkdir()
+    server = _serve(monkeypatch, "/api/households/shopping")
+    for content in ("not json", json.dumps({"http://mealie": "/api/elsewhere"})):
+        prefix_cache.write_text(content)
+        server.paths.clear()
+        MealieClient(mealie_url="http://mealie", api_key="k").list_shopping_lists()
+        assert server.paths == ["/api/households/shopping/lists"]
+
+
+def test_unwritable_cache_dir_does_not_break_discovery(monkeypatch, tmp_path):
+    blocker = tmp_path / "data"
+    blocker.write_text("")  # a file where the cache directory should be
+    monkeypatch.setattr(mealie_client, "_PREFIX_CACHE_PATH", blocker / "mealie_api_prefix.json")
+    _serve(monkeypatch, "/api/groups/shopping")
+
+    lists = MealieClient(mealie_url="http://mealie", api_key="k").list_shopping_lists()
+    assert [lst.id for lst in lists] == ["l1"]
+
+
+def test_http_errors_become_runtime_errors(client, monkeypatch):
+    mc, _ = client
+    monkeypatch.setattr(http, "_session", _Mealie("/api/households/shopping"))
+    with pytest.raises(RuntimeError, match="Mealie API error 404"):
+        mc.get_list_items("l1")
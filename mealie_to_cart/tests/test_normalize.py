@@ -24,3 +24,33 @@ def test_mixed_number():
     assert n.quantity == 1.75
     assert n.unit == "cup"
     assert n.grams == 220.0
+
+
+def test_query_tokens_precomputed():
+    n = normalize_line("2 cups Whole Milk")
+    assert n.query_tokens == frozenset({"whole", "milk"})
+
+
+def test_mixed_unicode_fraction():
+    n = normalize_line("1 ½ cups rolled oats")
+    assert n.quantity == 1.5
+    assert n.unit == "cup"
+    assert n.query == "rolled oats"
+
+
+def test_attached_unicode_fraction():
+    n = normalize_line("1½ cups rolled oats")
+    assert n.quantity == 1.5
+    assert n.unit == "cup"
+    assert n.raw == "1½ cups rolled oats"
+
+
+def test_zero_denominator_is_not_a_quantity():
+    n = normalize_line("1/0 cup milk")
+    assert n.quantity is None
+
+
+def test_or_inside_parentheses_does_not_split():
+    n = normalize_line("1 cup (butter or oil) flour")
+    assert n.query == "flour"
+    assert n.alt_query is None
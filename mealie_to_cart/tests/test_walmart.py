@@ -0,0 +1,40 @@
+from mealie_to_cart.walmart import _parse_product_card, _url_has_query
+
+
+def _card(h3, href="/ip/honey/123", img=None, ful=None):
+    return {"href": href, "h3": h3, "img": img, "ful": ful}
+
+
+def test_card_title_price_and_size():
+    c = _parse_product_card(_card("Great Value Clover Honey, 12 oz $3.47 28.9 ¢/oz"))
+    assert c is not None
+    assert c.title == "Great Value Clover Honey, 12 oz"
+    assert c.price == "$3.47"
+    assert c.size_text == "12 oz"
+    assert c.url == "https://www.walmart.com/ip/honey/123"
+
+
+def test_card_size_after_bare_dollar_sign():
+    c = _parse_product_card(_card("Value $ Bag 16.9 oz $3.47"))
+    assert c is not None
+    assert c.price == "$3.47"
+    assert c.size_text == "16.9 oz"
+
+
+def test_card_badge_and_was_stripped():
+    c = _parse_product_card(_card("Best seller Whole Milk, 1 gal Was $4.12 $3.98"))
+    assert c is not None
+    assert c.title == "Whole Milk, 1 gal"
+
+
+def test_card_without_link_or_title_is_skipped():
+    assert _parse_product_card(_card("Honey $3.47", href=None)) is None
+    assert _parse_product_card(_card("$3.47")) is None
+
+
+def test_url_has_query_matches_the_whole_query():
+    url = "https://www.walmart.com/search?q=Olive+Oil&typeahead=olive"
+    assert _url_has_query(url, "olive  oil")
+    assert not _url_has_query(url, "olive")
+    assert not _url_has_query("https://www.walmart.com/search?q=olive+oil+spray", "olive oil")
+    assert not _url_has_query("https://www.walmart.com/", "olive oil")
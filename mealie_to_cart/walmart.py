@@ -6,9 +6,9 @@ import re
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from urllib.parse import quote_plus
+from urllib.parse import parse_qs, quote_plus, urlsplit
 
-from playwright.sync_api import sync_playwright, Page, Browser
+from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
 
 from .models import WalmartCandidate
 
@@ -63,42 +63,71 @@ class WalmartSession:
 
     The browser stays connected the whole time — no repeated
     connect/disconnect cycles that trigger bot detection.
+
+    With ``new_page=True`` the session opens its own tab in the logged-in
+    context (closed again on exit) instead of driving the user's tab, so
+    several sessions can work side by side.  Playwright's sync API is bound
+    to the thread that started it: use one session per thread.
     """
 
-    def __init__(self, cdp_url: str = DEFAULT_CDP_URL):
+    def __init__(self, cdp_url: str = DEFAULT_CDP_URL, *, new_page: bool = False):
         self.cdp_url = cdp_url
+        self.new_page = new_page
         self._pw = None
         self._browser = None
         self.page: Page | None = None
+        # Set once search() has loaded the homepage on this session's page.
+        self.home_loaded = False
 
     def __enter__(self) -> "WalmartSession":
         self._pw = sync_playwright().start()
         self._browser = self._pw.chromium.connect_over_cdp(self.cdp_url)
         ctx = self._browser.contexts[0]
-        self.page = ctx.pages[0]
+        self.page = ctx.new_page() if self.new_page else ctx.pages[0]
         return self
 
     def __exit__(self, *exc):
         try:
-            if self._browser:
-                self._browser.close()
+            if self.new_page and self.page:
+                self.page.close()
         finally:
-            if self._pw:
-                self._pw.stop()
+            try:
+                if self._browser:
+                    self._browser.close()
+            finally:
+                if self._pw:
+                    self._pw.stop()
         self._pw = None
         self._browser = None
         self.page = None
+        self.home_loaded = False
 
 
-def open_home_and_screenshot(*, ws_endpoint: str, out_path: str = "artifacts/walmart_home.png") -> str:
+def open_home_and_screenshot(
+    *,
+    ws_endpoint: str,
+    out_path: str = "artifacts/walmart_home.png",
+    context: BrowserContext | None = None,
+) -> str:
+    """Screenshot the Walmart homepage.
+
+    If *context* is provided (e.g. from a `PlaywrightPool`) it is reused and
+    left open; otherwise a one-off Browserless connection is made.
+    """
     out = Path(out_path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
+    if context is not None:
+        page = context.new_page()
+        try:
+            _screenshot_home(page, out)
+        finally:
+            page.close()
+        return str(out)
+
     p, browser, page = _open_page(ws_endpoint)
     try:
-        page.goto("https://www.walmart.com/", wait_until="domcontentloaded", timeout=45_000)
-        page.wait_for_timeout(1500)
-        page.screenshot(path=str(out), full_page=True)
+        _screenshot_home(page, out)
         return str(out)
     finally:
         try:
@@ -107,6 +136,12 @@ def open_home_and_screenshot(*, ws_endpoint: str, out_path: str = "artifacts/wal
             p.stop()
 
 
+def _screenshot_home(page: Page, out: Path) -> None:
+    page.goto("https://www.walmart.com/", wait_until="domcontentloaded", timeout=45_000)
+    page.wait_for_timeout(1500)
+    page.screenshot(path=str(out), full_page=True)
+
+
 def ensure_logged_in(cfg: WalmartConfig) -> str:
     """Log into Walmart and persist cookies/storage state.
 
@@ -184,9 +219,14 @@ def search(
         page = session.page
 
     try:
-        # Navigate to Walmart home for a clean search state
-        page.goto("https://www.walmart.com/", wait_until="domcontentloaded", timeout=45_000)
-        page.wait_for_timeout(random.randint(2500, 4000))
+        # Navigate to Walmart home for a clean search state — once per session;
+        # afterwards any walmart.com page with the search bar will do.
+        reused = not own_connection and session.home_loaded and _has_search_bar(page)
+        if not reused:
+            page.goto("https://www.walmart.com/", wait_until="domcontentloaded", timeout=45_000)
+            page.wait_for_timeout(random.randint(2500, 4000))
+            if not own_connection:
+                session.home_loaded = True
 
         if _is_blocked(page):
             page.wait_for_timeout(random.randint(8000, 15000))
@@ -197,8 +237,14 @@ def search(
                     raise RuntimeError("Walmart bot block detected — CAPTCHA not solved in time.")
 
         _search_via_bar(page, query)
+        if reused and not _wait_for_results_of(page, query):
+            # Still showing the previous query's cards: start over from home.
+            page.goto("https://www.walmart.com/", wait_until="domcontentloaded", timeout=45_000)
+            page.wait_for_timeout(random.randint(2500, 4000))
+            _search_via_bar(page, query)
 
-        cards = page.query_selector_all("[data-item-id]")
+        # One round trip for every card instead of several CDP calls per card.
+        cards = page.evaluate(_EXTRACT_CARDS_JS)
         candidates: list[WalmartCandidate] = []
 
         for card in cards:
@@ -215,31 +261,69 @@ def search(
             p.stop()
 
 
-def _dismiss_overlays(page: Page) -> None:
-    """Try to dismiss common Walmart popups/overlays that block interaction."""
-    dismiss_selectors = [
-        # ATC confirmation dialog close button (the one that was blocking us)
-        'button[data-dca-intent="close"][aria-label="Close dialog"]',
-        'button[aria-label="Close dialog"]',
-        # Generic close / dismiss buttons
-        'button[aria-label="Close"]',
-        'button[aria-label="close"]',
-        'button:has-text("Close")',
-        'button:has-text("No thanks")',
-        'button:has-text("Dismiss")',
-        'button:has-text("Not now")',
-        '[data-testid="modal-close"]',
-        '[data-testid="close-button"]',
-        '.close-button',
-    ]
-    for sel in dismiss_selectors:
+DISMISS_SELECTORS = [
+    # ATC confirmation dialog close button (the one that was blocking us)
+    'button[data-dca-intent="close"][aria-label="Close dialog"]',
+    'button[aria-label="Close dialog"]',
+    # Generic close / dismiss buttons
+    'button[aria-label="Close"]',
+    'button[aria-label="close"]',
+    '[data-testid="modal-close"]',
+    '[data-testid="close-button"]',
+    '.close-button',
+]
+# Button labels matched like Playwright's :has-text() (case-insensitive substring).
+DISMISS_BUTTON_TEXTS = ["close", "no thanks", "dismiss", "not now"]
+
+# Clicks the first visible dismiss target; returns whether anything was clicked.
+_DISMISS_JS = """
+([sels, texts]) => {
+    const visible = el => {
+        if (!el || el.getClientRects().length === 0) return false;
+        return getComputedStyle(el).visibility !== 'hidden';
+    };
+    for (const s of sels) {
+        const el = Array.from(document.querySelectorAll(s)).find(visible);
+        if (el) { el.click(); return true; }
+    }
+    const buttons = Array.from(document.querySelectorAll('button')).filter(visible);
+    for (const t of texts) {
+        const el = buttons.find(b => (b.innerText || '').toLowerCase().includes(t));
+        if (el) { el.click(); return true; }
+    }
+    return false;
+}
+"""
+
+
+_SEARCH_INPUT_SELECTOR = 'input[type="search"], input[name="q"]'
+
+
+def _has_search_bar(page: Page) -> bool:
+    """True if *page* is on walmart.com and already shows the search input."""
+    if not (page.url or "").startswith("https://www.walmart.com"):
+        return False
+    try:
+        return page.query_selector(_SEARCH_INPUT_SELECTOR) is not None
+    except Exception:
+        return False
+
+
+def _dismiss_overlays(page: Page, *, max_rounds: int = 3) -> None:
+    """Try to dismiss common Walmart popups/overlays that block interaction.
+
+    All selectors are probed in one in-browser call; with no overlay (the
+    common case) that is the only round trip.  Stacked overlays are peeled
+    off one per round.
+    """
+    for _ in range(max_rounds):
         try:
-            btn = page.query_selector(sel)
-            if btn and btn.is_visible():
-                btn.click(force=True)
-                page.wait_for_timeout(500)
+            hit = page.evaluate(_DISMISS_JS, [DISMISS_SELECTORS, DISMISS_BUTTON_TEXTS])
         except Exception:
-            pass
+            return
+        if not hit:
+            return
+        page.wait_for_timeout(500)
 
 
 CAPTCHA_POLL_INTERVAL = 10  # seconds between checks
@@ -279,6 +363,25 @@ def _is_blocked(page: Page) -> bool:
     return False
 
 
+def _url_has_query(url: str, query: str) -> bool:
+    """True if *url* is a results page for exactly *query* (case/space-insensitive)."""
+    shown = parse_qs(urlsplit(url).query).get("q")
+    return bool(shown) and " ".join(shown[0].split()).lower() == " ".join(query.split()).lower()
+
+
+def _wait_for_results_of(page: Page, query: str, *, timeout_ms: int = 15_000) -> bool:
+    """Wait until *page* has navigated to the results for *query*."""
+    try:
+        page.wait_for_url(
+            lambda url: _url_has_query(url, query),
+            wait_until="domcontentloaded",
+            timeout=timeout_ms,
+        )
+    except Exception:
+        return False
+    return True
+
+
 def _search_via_bar(page: Page, query: str) -> None:
     """Type a query into Walmart's search bar and press Enter.
 
@@ -291,9 +394,7 @@ def _search_via_bar(page: Page, query: str) -> None:
 
     _dismiss_overlays(page)
 
-    search_input = page.wait_for_selector(
-        'input[type="search"], input[name="q"]', timeout=15_000
-    )
+    search_input = page.wait_for_selector(_SEARCH_INPUT_SELECTOR, timeout=15_000)
     # Force-click to bypass any remaining overlay
     search_input.click(force=True)
     page.wait_for_timeout(random.randint(200, 500))
@@ -305,60 +406,66 @@ def _search_via_bar(page: Page, query: str) -> None:
     page.wait_for_timeout(random.randint(4000, 7000))
 
 
-def _parse_product_card(card) -> WalmartCandidate | None:
-    """Extract structured data from a single Walmart product card DOM element."""
+# Raw fields of every product card on a results page, in page order.
+_EXTRACT_CARDS_JS = """
+() => Array.from(document.querySelectorAll('[data-item-id]')).map(c => {
+    const a = c.querySelector('a[link-identifier]');
+    const h = c.querySelector('h3');
+    const img = c.querySelector('img[data-testid="productTileImage"]');
+    const f = c.querySelector('[data-automation-id="fulfillment-badge"]');
+    return {
+        href: a ? a.getAttribute('href') : null,
+        h3: h ? h.innerText : '',
+        img: img ? img.getAttribute('src') : null,
+        ful: f ? f.innerText.trim() : null,
+    };
+})
+"""
+
+# "<badge> <title> [Was] $3.74 31.2 ¢/oz ..." — the title runs (lazily) up to
+# the first price, unit price or end of text. A lookahead at the start of the
+# title captures the first size in it (e.g. "12 oz") in the same match; it
+# stops at a real price ("$3.47") or unit price ("28.9 ¢"), not at a bare
+# "$" or "¢" inside the title.
+_CARD_TEXT_RE = re.compile(
+    r"^(?:(?:Overall pick|Best seller|Popular pick|Rollback) )*"
+    r"(?=(?:(?:(?!\$[\d.]|[\d.]+\s*¢).)*?"
+    r"(?P<size>\d+(?:\.\d+)?\s*(?i:fl\s*oz|oz|lb|ct|count|pack|ml|l|g|kg|gal))"
+    r"(?:\b|(?=[\d.]+\s*¢)))?)"
+    r"(?P<title>.*?)"
+    r"(?:\s+Was)?\s*(?:(?P<price>\$[\d.]+)|[\d.]+\s*¢|$)",
+    re.DOTALL,
+)
+
+
+def _parse_product_card(card: dict) -> WalmartCandidate | None:
+    """Build a candidate from one card's raw fields (see _EXTRACT_CARDS_JS)."""
     # ---- URL ----
-    link_el = card.query_selector("a[link-identifier]")
-    href = link_el.get_attribute("href") if link_el else None
+    href = card.get("href")
     if not href:
         return None
     url = f"https://www.walmart.com{href}" if href.startswith("/") else href
 
     # ---- Title + price live inside an <h3> ----
-    h3_el = card.query_selector("h3")
-    h3_text = h3_el.inner_text() if h3_el else ""
-
-    # Price (e.g. "$3.74")
-    price_match = re.search(r"\$[\d.]+", h3_text)
-    price = price_match.group(0) if price_match else None
-
-    # Title = h3 text minus badge prefix and trailing price/unit-price
-    title = h3_text
-    for badge in ("Overall pick ", "Best seller ", "Popular pick ", "Rollback "):
-        if title.startswith(badge):
-            title = title[len(badge) :]
-    if price_match:
-        title = title[: price_match.start()].strip()
-    # Remove any trailing unit-price fragment (e.g. "31.2 ¢/") or "Was" remnant
-    title = re.sub(r"\s*[\d.]+\s*¢.*$", "", title).strip()
-    title = re.sub(r"\s+Was\s*$", "", title).strip()
+    h3_text = card.get("h3") or ""
 
+    # Title = h3 text minus badge prefix and trailing price/unit-price/"Was";
+    # price (e.g. "$3.74") and size (often embedded in the title) come out of
+    # the same match.
+    m = _CARD_TEXT_RE.match(h3_text)
+    title = m["title"].strip()
     if not title:
         return None
-
-    # ---- Size / weight (often embedded in the title) ----
-    size_match = re.search(
-        r"(\d+(?:\.\d+)?\s*(?:fl\s*oz|oz|lb|ct|count|pack|ml|l|g|kg|gal))\b",
-        title,
-        re.IGNORECASE,
-    )
-    size_text = size_match.group(1) if size_match else None
-
-    # ---- Image ----
-    img_el = card.query_selector('img[data-testid="productTileImage"]')
-    img_url = img_el.get_attribute("src") if img_el else None
-
-    # ---- Fulfillment badge ----
-    ful_el = card.query_selector('[data-automation-id="fulfillment-badge"]')
-    fulfillment = ful_el.inner_text().strip() if ful_el else None
+    price = m["price"]
+    size_text = m["size"]
 
     return WalmartCandidate(
         title=title,
         url=url,
         price=price,
         size_text=size_text,
-        img_url=img_url,
-        fulfillment=fulfillment,
+        img_url=card.get("img"),
+        fulfillment=card.get("ful"),
     )
 
 
@@ -467,17 +574,39 @@ def _fill_login_form(page: Page, *, email: str, password: str) -> None:
     page.click('button:has-text("Sign in"), button:has-text("Sign In"), button[type="submit"]')
 
 
+# Same heuristic as the page.content() fallback below, evaluated in the
+# browser so only a bool crosses CDP instead of the whole HTML document.
+_LOGGED_IN_JS = """
+() => {
+    const html = document.documentElement.outerHTML.toLowerCase();
+    if (html.includes('sign in') && html.includes('create account')) return false;
+    return html.includes('account') || html.includes('my items') || html.includes('purchase history');
+}
+"""
+
+# Same heuristic for the page.content() fallback.  Case-insensitive search
+# on the original HTML instead of lowercasing a full copy of it.
+_SIGN_IN_RE = re.compile(r"sign in", re.IGNORECASE)
+_CREATE_ACCOUNT_RE = re.compile(r"create account", re.IGNORECASE)
+_LOGGED_IN_RE = re.compile(r"account|my items|purchase history", re.IGNORECASE)
+
+
 def _is_logged_in(page: Page) -> bool:
     # Heuristic: logged-in pages typically expose account link/menu.
     # We avoid brittle selectors; just look for common nav text.
     try:
-        content = page.content().lower()
+        return bool(page.evaluate(_LOGGED_IN_JS))
+    except Exception:
+        pass
+
+    try:
+        content = page.content()
     except Exception:
         return False
 
     # These are weak but surprisingly effective as a first pass.
-    if "sign in" in content and "create account" in content:
+    if _SIGN_IN_RE.search(content) and _CREATE_ACCOUNT_RE.search(content):
         return False
 
     # Look for "account" in header/nav.
-    return "account" in content or "my items" in content or "purchase history" in content
+    return _LOGGED_IN_RE.search(content) is not None